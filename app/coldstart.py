@@ -0,0 +1,169 @@
+"""Cold-start budget check for the API process.
+
+Measures, in a fresh interpreter, the time it takes to import ``app.main``,
+run the startup hook and serve the first ``GET /tools`` request, and exits
+with a non-zero status when that exceeds the budget. It also fails if the
+API process imported ingest-only modules (httpx, source adapters), since
+those should stay lazily loaded. Run it in CI or before deploying::
+
+    python -m app.coldstart --budget-ms 2000
+
+The database is a throwaway SQLite file migrated with ``app.db.init_schema``
+and the API is booted with ``DB_STARTUP_MODE=verify``, as in production.
+Only the standard library is imported at module level so the measurement is
+not skewed by this module itself.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+# Default budget for import + startup + first request, in milliseconds
+BUDGET_MS = float(os.getenv("COLDSTART_BUDGET_MS", "2000"))
+
+# Modules that only the ingest job should load
+INGEST_ONLY_MODULES = ("httpx", "app.ingest", "app.sources")
+
+
+async def _first_request(app) -> int:
+    """Drive the ASGI app through lifespan startup and one GET request."""
+    lifespan_queue: asyncio.Queue = asyncio.Queue()
+    await lifespan_queue.put({"type": "lifespan.startup"})
+    started = asyncio.get_running_loop().create_future()
+
+    async def lifespan_send(message: dict) -> None:
+        if message["type"] == "lifespan.startup.complete":
+            started.set_result(None)
+        elif message["type"] == "lifespan.startup.failed":
+            started.set_exception(RuntimeError(message.get("message")))
+
+    lifespan_scope = {"type": "lifespan", "asgi": {"version": "3.0"}}
+    lifespan = asyncio.ensure_future(
+        app(lifespan_scope, lifespan_queue.get, lifespan_send)
+    )
+    await started
+
+    status = 0
+    body_sent = False
+
+    async def receive() -> dict:
+        nonlocal body_sent
+        if body_sent:
+            # Block until cancelled, like a client that keeps the socket open
+            await asyncio.Event().wait()
+        body_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/tools",
+        "raw_path": b"/tools",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"coldstart")],
+        "client": ("127.0.0.1", 0),
+        "server": ("coldstart", 80),
+    }
+    await app(scope, receive, send)
+    lifespan.cancel()
+    return status
+
+
+def _child() -> None:
+    """Measure import and first request inside the current interpreter."""
+    t0 = time.perf_counter()
+    from app.main import app
+
+    t1 = time.perf_counter()
+    status = asyncio.run(_first_request(app))
+    t2 = time.perf_counter()
+    loaded = sorted(
+        name
+        for name in sys.modules
+        if any(name == m or name.startswith(m + ".") for m in INGEST_ONLY_MODULES)
+    )
+    print(
+        json.dumps(
+            {
+                "import_ms": (t1 - t0) * 1000,
+                "first_request_ms": (t2 - t1) * 1000,
+                "status": status,
+                "ingest_modules": loaded,
+            }
+        )
+    )
+
+
+def measure() -> dict:
+    """Run the measurement in a fresh interpreter against a scratch database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'coldstart.db')}"
+        env["DB_STARTUP_MODE"] = "verify"
+        # Measure the plain database path, not snapshot serving
+        env.pop("SNAPSHOT_DIR", None)
+        subprocess.run([sys.executable, "-m", "app.db"], env=env, check=True)
+        started = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-m", "app.coldstart", "--child"],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point; exits 1 when the budget is exceeded."""
+    parser = argparse.ArgumentParser(prog="python -m app.coldstart")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        _child()
+        return
+
+    result = measure()
+    total = result["import_ms"] + result["first_request_ms"]
+    print(
+        f"import {result['import_ms']:.0f} ms, "
+        f"first request {result['first_request_ms']:.0f} ms "
+        f"(total {total:.0f} ms, budget {args.budget_ms:.0f} ms; "
+        f"process {result['process_ms']:.0f} ms)"
+    )
+    failures = []
+    if result["status"] != 200:
+        failures.append(f"first request returned HTTP {result['status']}")
+    if total > args.budget_ms:
+        over = total - args.budget_ms
+        failures.append(f"cold start exceeded budget by {over:.0f} ms")
+    if result["ingest_modules"]:
+        failures.append(
+            "API process imported ingest-only modules: "
+            + ", ".join(result["ingest_modules"])
+        )
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
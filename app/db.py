@@ -4,15 +4,35 @@ This module configures the SQLAlchemy engine and session for the ECHOLOVE
 project. By default, it connects to a local SQLite database, but the
 connection string can be overridden with the `DATABASE_URL` environment
 variable to point to a PostgreSQL database or another backend.
+
+Run ``python -m app.db`` to create the tables and record the schema version
+before starting the API with ``DB_STARTUP_MODE=verify``.
+
+When ``SNAPSHOT_DIR`` is set, the engine below writes to a staging database
+inside that directory instead, and the API serves read-only snapshots
+published from it (see :mod:`app.snapshot`).
 """
 
 import os
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 # Read the database URL from environment or default to a local SQLite file
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./echolove.db")
 
+# Directory holding the staging database and published snapshots, if any
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "")
+
+# Database the first staging file is seeded from when no snapshot exists yet
+SEED_DATABASE_URL = ""
+if SNAPSHOT_DIR:
+    SEED_DATABASE_URL = DATABASE_URL
+    # Ingest and maintenance write to the staging file, never to a snapshot
+    STAGING_PATH = os.path.join(os.path.abspath(SNAPSHOT_DIR), "staging.db")
+    DATABASE_URL = f"sqlite:///{STAGING_PATH}"
+
 # SQLite requires a special flag to allow connections across threads
 connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 
@@ -50,4 +70,60 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def init_schema() -> None:
+    """Create all tables and record the current schema version.
+
+    This is the slow path: it imports every model and inspects the database.
+    Run it once per deployment (or from the ingest job), not on API boot.
+    """
+    from .models import SCHEMA_VERSION, SchemaVersion
+
+    if engine.dialect.name == "sqlite":
+        # Lets the maintenance job free pages without a full VACUUM. SQLite
+        # only honours this before the first table is created; existing
+        # files are converted by `python -m app.maintenance prune`.
+        with engine.connect() as conn:
+            conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.merge(SchemaVersion(id=1, version=SCHEMA_VERSION))
+        db.commit()
+
+
+def verify_schema(bind: Optional[Engine] = None) -> None:
+    """Check that the database has been migrated to the current schema.
+
+    Reads a single row by primary key, so the cost does not depend on the
+    size of the database. Raises ``RuntimeError`` if the schema is missing
+    or at a different version.
+
+    Args:
+        bind: Engine to check; defaults to the read-write engine.
+    """
+    from .models import SCHEMA_VERSION
+
+    try:
+        with (bind or engine).connect() as conn:
+            version = conn.execute(
+                text("SELECT version FROM schema_version WHERE id = 1")
+            ).scalar()
+    except Exception as exc:
+        raise RuntimeError(
+            "Database schema is not initialized; run `python -m app.db`"
+        ) from exc
+    if version != SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {version} does not match expected "
+            f"{SCHEMA_VERSION}; run `python -m app.db`"
+        )
+
+
+if __name__ == "__main__":
+    # Go through the package module: under ``python -m`` this file is loaded a
+    # second time as ``__main__``, and the models register on app.db.Base.
+    from app.db import init_schema as _init_schema
+
+    _init_schema()
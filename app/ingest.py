@@ -3,24 +3,45 @@
 import asyncio
 import hashlib
 from datetime import datetime, timezone
-from typing import Optional, Union, List
-from sqlalchemy import select
+import logging
+from typing import Dict, Iterable, Optional, Union, List
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from .db import engine, Base, SessionLocal
+from .db import SNAPSHOT_DIR, SessionLocal, init_schema
 from .models import Tool, Review, Origin, SourceKind
+from .snapshot import prepare_staging, publish
+from .sources.base import QuotaExhausted, SourceAdapter
+from .sources.registry import available_adapters, create_adapters
 from .utils import slugify, head_ok
-from .sources.hackernews import HackerNewsAdapter
-from .sources.stackexchange import StackExchangeAdapter
-from .sources.github import GitHubAdapter
 
+logger = logging.getLogger(__name__)
 
-# Register adapters here. Each entry is a tuple of the SourceKind key
-# and an instance of the adapter with configuration.
-ADAPTERS = [
-    ("hacker_news", HackerNewsAdapter(max_items=40)),
-    ("stack_exchange", StackExchangeAdapter(pages=1)),
-    ("github", GitHubAdapter(pages=1)),
-]
+
+def load_adapters(keys: Optional[List[str]] = None) -> Dict[str, SourceAdapter]:
+    """Return configured adapters keyed by their ``SourceKind`` value.
+
+    Adapters are discovered through :mod:`app.sources.registry`, which only
+    imports them (and through them httpx) when first called, so processes
+    importing this module for its helpers do not pay for the HTTP stack.
+
+    Reviews store their source as a ``SourceKind``, so only adapters whose
+    key is a ``SourceKind`` value can be ingested. When ``keys`` is omitted,
+    other registered adapters (e.g. from a plugin) are skipped with a
+    warning; requesting one explicitly raises ``ValueError``.
+    """
+    known = {kind.value for kind in SourceKind}
+    if keys is None:
+        keys = []
+        for key in available_adapters():
+            if key in known:
+                keys.append(key)
+            else:
+                logger.warning("Skipping adapter %r: not a known SourceKind", key)
+    else:
+        unknown = [key for key in keys if key not in known]
+        if unknown:
+            raise ValueError(f"Not a known SourceKind: {', '.join(unknown)}")
+    return create_adapters(keys)
 
 
 def _tags_to_string(tags: Union[List[str], str, None]) -> Optional[str]:
@@ -123,34 +144,103 @@ def upsert_tool(
     return tool
 
 
-async def run_ingest() -> None:
-    """Main asynchronous entry point for running the ingestion."""
-    Base.metadata.create_all(bind=engine)
-    # First pass: discover and insert tools
+async def ingest_source(db: Session, key: str, adapter: SourceAdapter) -> int:
+    """Discover tools from one adapter and store them; returns the item count.
+
+    If the adapter runs out of API quota midway, the items discovered so far
+    are kept and :class:`QuotaExhausted` is re-raised after committing.
+    """
+    kind = SourceKind(key)
+    seen = set()
+    try:
+        async for item in adapter.discover():
+            # Raw reference is a stable hash of the source URL and tool name
+            ref = hashlib.sha1(
+                (item["review"]["source_url"] + item["name"]).encode()
+            ).hexdigest()[:12]
+            # Concurrent queries may return the same item more than once
+            if ref in seen:
+                continue
+            seen.add(ref)
+            upsert_tool(
+                db,
+                item,
+                kind,
+                ref,
+                item["review"]["source_url"],
+                item["review"],
+            )
+    except QuotaExhausted:
+        db.commit()
+        raise
+    db.commit()
+    return len(seen)
+
+
+async def check_links(kinds: Optional[Iterable[SourceKind]] = None) -> None:
+    """Check the status of each review's URL, optionally for some sources.
+
+    Every review snapshot of a link shares its status, so each distinct URL
+    is requested only once. All links are checked before anything is
+    written, so the write transaction is not held open across the network
+    requests.
+
+    ``last_checked_at`` is set when a link is first found dead, so the
+    retention job (:mod:`app.maintenance`) ages archived reviews from the
+    moment they were archived rather than from when they were ingested.
+    """
     with SessionLocal() as db:
-        for key, adapter in ADAPTERS:
-            kind = SourceKind(key)
-            async for item in adapter.discover():
-                # Raw reference is a stable hash of the source URL and tool name
-                ref = hashlib.sha1(
-                    (item["review"]["source_url"] + item["name"]).encode()
-                ).hexdigest()[:12]
-                upsert_tool(
-                    db,
-                    item,
-                    kind,
-                    ref,
-                    item["review"]["source_url"],
-                    item["review"],
+        stmt = select(Review.source_url).distinct()
+        if kinds is not None:
+            kinds = list(kinds)
+            stmt = stmt.where(Review.source_kind.in_(kinds))
+        urls = db.execute(stmt).scalars().all()
+        # End the read transaction before going to the network
+        db.rollback()
+        results = {url: await head_ok(url) for url in urls}
+        now = datetime.now(timezone.utc)
+        for url, ok in results.items():
+            change = update(Review).where(Review.source_url == url)
+            if kinds is not None:
+                change = change.where(Review.source_kind.in_(kinds))
+            if ok:
+                db.execute(change.values(status="active"))
+            else:
+                # Only reviews that were still active change status now;
+                # already archived ones keep the time they were archived
+                db.execute(
+                    change.where(Review.status == "active").values(
+                        status="archived", last_checked_at=now
+                    )
                 )
-            db.commit()
+        db.commit()
 
-    # Second pass: check the status of each review's URL
+
+async def run_ingest(keys: Optional[List[str]] = None) -> None:
+    """Main asynchronous entry point for running the ingestion.
+
+    Runs every registered adapter once, or only those listed in ``keys``.
+    For recurring runs with per-source intervals use :mod:`app.scheduler`.
+    With ``SNAPSHOT_DIR`` set, the run writes to the staging database and
+    publishes a new snapshot when it finishes.
+    """
+    if SNAPSHOT_DIR:
+        prepare_staging()
+    init_schema()
+    adapters = load_adapters(keys)
+    # First pass: discover and insert tools
     with SessionLocal() as db:
-        for review in db.execute(select(Review)).scalars().all():
-            ok = await head_ok(review.source_url)
-            review.status = "active" if ok else "archived"
-        db.commit()
+        for key, adapter in adapters.items():
+            try:
+                await ingest_source(db, key, adapter)
+            except QuotaExhausted as exc:
+                logger.warning("%s: %s", key, exc)
+
+    # Second pass: check the status of each review's URL
+    await check_links(SourceKind(key) for key in adapters)
+
+    if SNAPSHOT_DIR:
+        publish()
 
 
 if __name__ == "__main__":
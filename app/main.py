@@ -1,13 +1,28 @@
 """FastAPI application exposing the ECHOLOVE API."""
 
-from fastapi import FastAPI, Depends, HTTPException
+import os
+import logging
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from typing import Optional, List
-from .db import Base, engine, get_db
+from .db import get_db, init_schema, verify_schema
 from .models import Tool, Review
 from .schemas import ToolOut, ReviewOut
+from .snapshot import SnapshotUnavailable, reader as snapshot_reader
+
+# How the schema is prepared on boot: "create" runs create_all (convenient for
+# local development), "verify" only checks the schema version row and expects
+# the database to have been migrated with `python -m app.db` beforehand.
+STARTUP_MODE = os.getenv("DB_STARTUP_MODE", "create")
+
+# With SNAPSHOT_DIR set, requests read from the published read-only snapshot
+# and never contend with ingest writes to the staging database.
+get_session = snapshot_reader.get_db if snapshot_reader else get_db
+
+logger = logging.getLogger(__name__)
 
 # Initialize the FastAPI app
 app = FastAPI(title="ECHOLOVE API", version="0.1")
@@ -24,17 +39,37 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(SnapshotUnavailable)
+def snapshot_unavailable(
+    request: Request, exc: SnapshotUnavailable
+) -> JSONResponse:
+    """Answer 503 until the first snapshot has been published."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
 @app.on_event("startup")
 def startup() -> None:
-    """Create database tables on startup."""
-    Base.metadata.create_all(bind=engine)
+    """Prepare or verify the database schema on startup.
+
+    In snapshot mode ``DB_STARTUP_MODE`` does not apply: snapshots are
+    read-only and the reader verifies each one's schema before serving it.
+    Until the first publish the API starts anyway and answers 503.
+    """
+    if snapshot_reader:
+        snapshot_reader.install_signal_handler()
+        if not snapshot_reader.available():
+            logger.warning("No snapshot published yet; serving 503 until then")
+    elif STARTUP_MODE == "verify":
+        verify_schema()
+    else:
+        init_schema()
 
 
 @app.get("/tools", response_model=List[ToolOut])
 def list_tools(
     q: Optional[str] = None,
     tag: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> List[Tool]:
     """Return a list of tools, optionally filtered by name or tag.
 
@@ -56,7 +91,7 @@ def list_tools(
 
 
 @app.get("/tools/{slug}", response_model=ToolOut)
-def get_tool(slug: str, db: Session = Depends(get_db)) -> Tool:
+def get_tool(slug: str, db: Session = Depends(get_session)) -> Tool:
     """Retrieve a single tool by slug."""
     tool = db.execute(select(Tool).where(Tool.slug == slug)).scalar_one_or_none()
     if not tool:
@@ -69,7 +104,7 @@ def get_tool(slug: str, db: Session = Depends(get_db)) -> Tool:
 
 
 @app.get("/reviews", response_model=List[ReviewOut])
-def all_reviews(db: Session = Depends(get_db)) -> List[Review]:
+def all_reviews(db: Session = Depends(get_session)) -> List[Review]:
     """Return a list of all reviews, ordered by publication date."""
     reviews = db.execute(
         select(Review).order_by(Review.published_at.desc().nullslast())
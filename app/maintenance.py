@@ -0,0 +1,509 @@
+"""Retention, archival and vacuum job for the ECHOLOVE database.
+
+Ingestion only ever adds rows: every run appends a fresh review snapshot and
+dead links are merely flagged ``archived``/``gone``. This module prunes that
+history according to a retention policy. Expired rows are first written to a
+compressed NDJSON cold archive (zstd when the ``zstandard`` package is
+installed, gzip otherwise) that can be re-imported later, then deleted in
+small chunks so that the API never waits on a long write lock. Tools left
+without any review are archived and removed together with their origins.
+The run ends with ``ANALYZE`` and, on SQLite, an incremental vacuum (a full
+``VACUUM`` only with ``--full-vacuum`` or to convert a database that was
+created without ``auto_vacuum=INCREMENTAL``).
+
+Usage::
+
+    python -m app.maintenance prune [--dry-run] [--keep-snapshots N] ...
+    python -m app.maintenance restore archive/echolove-...ndjson.zst
+"""
+
+import argparse
+import gzip
+import io
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from enum import Enum as PyEnum
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    Select,
+    Table,
+    and_,
+    delete,
+    exists,
+    false,
+    func,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from .db import SNAPSHOT_DIR, engine as default_engine
+from .models import Origin, Review, Tool
+from .snapshot import prepare_staging
+
+# Defaults for the retention policy, overridable via environment variables
+KEEP_SNAPSHOTS = int(os.getenv("RETENTION_KEEP_SNAPSHOTS", "5"))
+ARCHIVED_DAYS = int(os.getenv("RETENTION_ARCHIVED_DAYS", "90"))
+CHUNK_SIZE = int(os.getenv("RETENTION_CHUNK_SIZE", "500"))
+ARCHIVE_DIR = os.getenv("RETENTION_ARCHIVE_DIR", "./archive")
+
+# Review statuses that mark a dead link
+DEAD_STATUSES = ("archived", "gone")
+
+# Parents are restored before children so reassigned tool ids can be remapped
+RESTORE_ORDER = ("tools", "origins", "reviews")
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionPolicy:
+    """Describes which rows are expired and how they are removed.
+
+    Args:
+        keep_snapshots: Number of most recent review snapshots to keep for
+            each distinct source link of a tool. ``0`` disables the rule.
+        archived_days: Drop ``archived``/``gone`` reviews whose link was
+            found dead more than this many days ago. ``0`` disables the rule.
+        chunk_size: Maximum number of rows deleted per transaction.
+    """
+
+    def __init__(
+        self,
+        keep_snapshots: int = KEEP_SNAPSHOTS,
+        archived_days: int = ARCHIVED_DAYS,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.keep_snapshots = keep_snapshots
+        self.archived_days = archived_days
+        self.chunk_size = chunk_size
+
+
+def _open_archive(path: str, mode: str) -> IO[str]:
+    """Open a compressed NDJSON archive for reading (``r``) or writing (``w``).
+
+    The compression is chosen from the file suffix: ``.zst`` uses zstandard,
+    ``.gz`` uses gzip, anything else is treated as plain text.
+    """
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise RuntimeError(
+                "zstandard is required for .zst archives; install it or use .gz"
+            ) from exc
+        if mode == "w":
+            raw = zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+        else:
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def default_archive_path(directory: str = ARCHIVE_DIR) -> str:
+    """Return a timestamped archive path, preferring zstd when available."""
+    try:
+        import zstandard  # noqa: F401
+
+        suffix = ".ndjson.zst"
+    except ImportError:
+        suffix = ".ndjson.gz"
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return os.path.join(directory, f"echolove-{stamp}{suffix}")
+
+
+def _encode_row(table: Table, row: Mapping[str, Any]) -> dict:
+    """Convert a row mapping into a JSON-serializable dict."""
+    out = {}
+    for col in table.columns:
+        value = row.get(col.name)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, PyEnum):
+            value = value.value
+        out[col.name] = value
+    return out
+
+
+def _decode_row(table: Table, data: dict) -> dict:
+    """Inverse of :func:`_encode_row`, restoring datetimes and enums."""
+    out = {}
+    for col in table.columns:
+        if col.name not in data:
+            continue
+        value = data[col.name]
+        if value is not None:
+            if isinstance(col.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(col.type, Enum) and col.type.enum_class:
+                value = col.type.enum_class(value)
+        out[col.name] = value
+    return out
+
+
+def _expired_reviews(policy: RetentionPolicy) -> Select:
+    """Return a query for the ids of reviews outside the retention policy."""
+    rules = []
+    columns = [Review.id]
+    if policy.keep_snapshots > 0:
+        # Rank snapshots of the same source link, newest first
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=(
+                    Review.tool_id,
+                    Review.source_kind,
+                    Review.source_url,
+                ),
+                order_by=(
+                    Review.last_checked_at.desc().nullslast(),
+                    Review.id.desc(),
+                ),
+            )
+            .label("rank")
+        )
+        columns.append(rank)
+    ranked = select(*columns, Review.status, Review.last_checked_at).subquery()
+    if policy.keep_snapshots > 0:
+        rules.append(ranked.c.rank > policy.keep_snapshots)
+    if policy.archived_days > 0:
+        # check_links sets last_checked_at when a link is found dead, so
+        # this is the time since the review was archived. Timestamps are
+        # stored naive (UTC) by the DateTime columns.
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            days=policy.archived_days
+        )
+        rules.append(
+            and_(
+                ranked.c.status.in_(DEAD_STATUSES),
+                ranked.c.last_checked_at < cutoff,
+            )
+        )
+    return select(ranked.c.id).where(or_(false(), *rules))
+
+
+def _expired_review_ids(conn: Connection, policy: RetentionPolicy) -> List[int]:
+    """Return ids of reviews that fall outside the retention policy."""
+    return list(conn.execute(_expired_reviews(policy).order_by("id")).scalars())
+
+
+def _reviewless_tool_ids(conn: Connection, policy: RetentionPolicy) -> List[int]:
+    """Return ids of tools that have no review left once expired ones are gone.
+
+    The anti-join runs in the database, so the cost does not grow with the
+    number of rows pulled into Python.
+    """
+    live = exists().where(
+        Review.tool_id == Tool.id,
+        Review.id.notin_(_expired_reviews(policy)),
+    )
+    return list(
+        conn.execute(select(Tool.id).where(~live).order_by(Tool.id)).scalars()
+    )
+
+
+def _chunks(ids: List[int], size: int) -> Iterator[List[int]]:
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+def _move_rows(
+    conn: Connection, table: Table, ids: List[int], archive: Optional[IO[str]]
+) -> int:
+    """Write the given rows to the archive, then delete them."""
+    if not ids:
+        return 0
+    if archive is not None:
+        rows = conn.execute(select(table).where(table.c.id.in_(ids)))
+        for row in rows:
+            record = {"table": table.name, "row": _encode_row(table, row._mapping)}
+            archive.write(json.dumps(record) + "\n")
+        # Make sure the archived rows reach disk before they are deleted
+        archive.flush()
+    return conn.execute(delete(table).where(table.c.id.in_(ids))).rowcount
+
+
+def _archive_reviews(
+    engine: Engine, ids: List[int], chunk_size: int, archive: Optional[IO[str]]
+) -> int:
+    """Move reviews into the archive, one short transaction per chunk."""
+    deleted = 0
+    for chunk in _chunks(ids, chunk_size):
+        with engine.begin() as conn:
+            deleted += _move_rows(conn, Review.__table__, chunk, archive)
+    return deleted
+
+
+def _archive_tools(
+    engine: Engine, ids: List[int], chunk_size: int, archive: Optional[IO[str]]
+) -> Dict[str, int]:
+    """Move review-less tools and their origins into the archive."""
+    counts = {"tools": 0, "origins": 0}
+    for chunk in _chunks(ids, chunk_size):
+        with engine.begin() as conn:
+            # Skip tools that picked up a review since the ids were collected
+            tool_ids = list(
+                conn.execute(
+                    select(Tool.id).where(
+                        Tool.id.in_(chunk),
+                        ~exists().where(Review.tool_id == Tool.id),
+                    )
+                ).scalars()
+            )
+            origin_ids = list(
+                conn.execute(
+                    select(Origin.id).where(Origin.tool_id.in_(tool_ids))
+                ).scalars()
+            )
+            counts["origins"] += _move_rows(
+                conn, Origin.__table__, origin_ids, archive
+            )
+            counts["tools"] += _move_rows(conn, Tool.__table__, tool_ids, archive)
+    return counts
+
+
+def vacuum(engine: Engine = default_engine, full: bool = False) -> None:
+    """Reclaim free space and refresh planner statistics.
+
+    On SQLite this runs ``PRAGMA incremental_vacuum``, which only frees pages
+    and does not rewrite the file. A full ``VACUUM``, which holds an exclusive
+    lock for the whole rewrite, runs when ``full`` is set or once to switch
+    a database created without ``auto_vacuum=INCREMENTAL`` over to it.
+    """
+    # VACUUM cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if engine.dialect.name == "sqlite":
+            # auto_vacuum: 0 = none, 1 = full, 2 = incremental
+            mode = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+            if mode != 2:
+                # Only takes effect with the VACUUM below
+                conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            if full or mode != 2:
+                conn.execute(text("VACUUM"))
+            else:
+                conn.execute(text("PRAGMA incremental_vacuum"))
+            conn.execute(text("ANALYZE"))
+        else:
+            conn.execute(text("VACUUM FULL ANALYZE" if full else "VACUUM ANALYZE"))
+
+
+def prune(
+    policy: Optional[RetentionPolicy] = None,
+    archive_path: Optional[str] = None,
+    dry_run: bool = False,
+    run_vacuum: bool = True,
+    full_vacuum: bool = False,
+    engine: Engine = default_engine,
+) -> dict:
+    """Apply the retention policy and return the number of rows removed.
+
+    Expired rows are appended to ``archive_path`` before deletion. Pass an
+    empty string to delete without archiving. With ``dry_run`` nothing is
+    written and the returned counts describe what would be removed.
+    """
+    policy = policy or RetentionPolicy()
+    with engine.connect() as conn:
+        review_ids = _expired_review_ids(conn, policy)
+        tool_ids = _reviewless_tool_ids(conn, policy)
+        if dry_run:
+            origins = 0
+            for chunk in _chunks(tool_ids, policy.chunk_size):
+                origins += conn.execute(
+                    select(func.count(Origin.id)).where(Origin.tool_id.in_(chunk))
+                ).scalar()
+            return {
+                "reviews": len(review_ids),
+                "tools": len(tool_ids),
+                "origins": origins,
+            }
+    counts = {"reviews": 0, "tools": 0, "origins": 0}
+    if review_ids or tool_ids:
+        if archive_path is None:
+            archive_path = default_archive_path()
+        archive = None
+        if archive_path:
+            os.makedirs(os.path.dirname(archive_path) or ".", exist_ok=True)
+            archive = _open_archive(archive_path, "w")
+        try:
+            counts["reviews"] = _archive_reviews(
+                engine, review_ids, policy.chunk_size, archive
+            )
+            counts.update(
+                _archive_tools(engine, tool_ids, policy.chunk_size, archive)
+            )
+        finally:
+            if archive is not None:
+                archive.close()
+    if run_vacuum:
+        vacuum(engine, full=full_vacuum)
+    return counts
+
+
+def _read_archive(archive_path: str, table_name: str) -> Iterator[dict]:
+    """Yield the archived rows of one table."""
+    with _open_archive(archive_path, "r") as archive:
+        for line in archive:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record["table"] == table_name:
+                yield record["row"]
+
+
+def _find_natural_match(
+    conn: Connection, table: Table, row: dict
+) -> Optional[int]:
+    """Return the id of a row with the same unique key, if there is one."""
+    if table.name == "tools":
+        stmt = select(table.c.id).where(table.c.slug == row["slug"])
+    elif table.name == "origins":
+        stmt = select(table.c.id).where(
+            table.c.source_kind == row["source_kind"],
+            table.c.raw_ref == row["raw_ref"],
+        )
+    else:
+        return None
+    return conn.execute(stmt).scalar()
+
+
+def _find_copy(conn: Connection, table: Table, row: dict) -> Optional[int]:
+    """Return the id of a row equal to ``row`` in every column but the id."""
+    conditions = [
+        table.c[key].is_(None) if value is None else table.c[key] == value
+        for key, value in row.items()
+    ]
+    return conn.execute(select(table.c.id).where(*conditions)).scalar()
+
+
+def restore(archive_path: str, engine: Engine = default_engine) -> dict:
+    """Re-import rows from a cold archive.
+
+    A row is counted as already present if an identical row with its id
+    exists, or if a tool with the same slug / an origin with the same source
+    reference exists. If its id has since been reused by a different row, the
+    archived row is inserted under a new id (``reassigned``), and reviews and
+    origins of a reassigned tool follow it to the new id.
+    """
+    tables = {
+        t.name: t for t in (Tool.__table__, Origin.__table__, Review.__table__)
+    }
+    counts = {"restored": 0, "present": 0, "reassigned": 0}
+    # Archived tool id -> id of the tool in the database
+    tool_ids: Dict[int, int] = {}
+    with engine.begin() as conn:
+        for name in RESTORE_ORDER:
+            table = tables[name]
+            for data in _read_archive(archive_path, name):
+                row = _decode_row(table, data)
+                if "tool_id" in row:
+                    row["tool_id"] = tool_ids.get(row["tool_id"], row["tool_id"])
+                archived_id = row["id"]
+
+                match = _find_natural_match(conn, table, row)
+                if match is not None:
+                    counts["present"] += 1
+                    if name == "tools":
+                        tool_ids[archived_id] = match
+                    continue
+
+                existing = conn.execute(
+                    select(table).where(table.c.id == archived_id)
+                ).first()
+                if existing is None:
+                    conn.execute(table.insert().values(**row))
+                    counts["restored"] += 1
+                    continue
+                if _encode_row(table, existing._mapping) == _encode_row(table, row):
+                    counts["present"] += 1
+                    continue
+
+                # The id was reused by a different row; keep both, unless an
+                # earlier restore already re-inserted this one under a new id
+                del row["id"]
+                copy = _find_copy(conn, table, row)
+                if copy is not None:
+                    counts["present"] += 1
+                    if name == "tools":
+                        tool_ids[archived_id] = copy
+                    continue
+                new_id = conn.execute(
+                    table.insert().values(**row)
+                ).inserted_primary_key[0]
+                if name == "tools":
+                    tool_ids[archived_id] = new_id
+                logger.warning(
+                    "%s %d: id already in use, restored as %d",
+                    name,
+                    archived_id,
+                    new_id,
+                )
+                counts["reassigned"] += 1
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(prog="python -m app.maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_prune = sub.add_parser("prune", help="archive and delete expired rows")
+    p_prune.add_argument("--keep-snapshots", type=int, default=KEEP_SNAPSHOTS)
+    p_prune.add_argument("--archived-days", type=int, default=ARCHIVED_DAYS)
+    p_prune.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    p_prune.add_argument(
+        "--archive", default=None, help="archive file (default: timestamped)"
+    )
+    p_prune.add_argument(
+        "--no-archive", action="store_true", help="delete without archiving"
+    )
+    p_prune.add_argument("--no-vacuum", action="store_true")
+    p_prune.add_argument(
+        "--full-vacuum",
+        action="store_true",
+        help="rewrite the whole database file instead of an incremental vacuum",
+    )
+    p_prune.add_argument("--dry-run", action="store_true")
+
+    p_restore = sub.add_parser("restore", help="re-import an archive file")
+    p_restore.add_argument("archive")
+
+    args = parser.parse_args(argv)
+    if SNAPSHOT_DIR:
+        # Work on the seeded staging database, not an empty new file
+        prepare_staging()
+    if args.command == "prune":
+        policy = RetentionPolicy(
+            keep_snapshots=args.keep_snapshots,
+            archived_days=args.archived_days,
+            chunk_size=args.chunk_size,
+        )
+        counts = prune(
+            policy,
+            archive_path="" if args.no_archive else args.archive,
+            dry_run=args.dry_run,
+            run_vacuum=not args.no_vacuum,
+            full_vacuum=args.full_vacuum,
+        )
+        verb = "would remove" if args.dry_run else "removed"
+        print(
+            f"{verb} {counts['reviews']} reviews, {counts['tools']} tools, "
+            f"{counts['origins']} origins"
+        )
+    else:
+        counts = restore(args.archive)
+        print(
+            f"restored {counts['restored']} rows, "
+            f"{counts['reassigned']} under new ids, "
+            f"{counts['present']} already present"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -112,4 +112,20 @@ class Origin(Base):
         UniqueConstraint(
             "source_kind", "raw_ref", name="uq_origin_kind_ref"
         ),
-    )
\ No newline at end of file
+    )
+
+# Bump whenever the models above change in a way that needs a migration.
+SCHEMA_VERSION = 1
+
+
+class SchemaVersion(Base):
+    """Single-row table recording the schema version of the database.
+
+    The API can check this row at startup instead of running
+    ``create_all``, which keeps cold starts fast on a migrated database.
+    """
+
+    __tablename__ = "schema_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer)
@@ -0,0 +1,116 @@
+"""Long-running scheduler that ingests each source on its own interval.
+
+Every registered adapter runs every ``config.interval`` seconds within the
+budget of its own :class:`~app.sources.base.Quota`: cheap sources such as
+Hacker News can run often while GitHub searches run rarely. When a source
+runs out of quota, what it discovered so far is kept and its next run is
+postponed until the quota frees up instead of being retried immediately.
+
+Sources run one at a time so that only one write transaction is open
+against the database; queries within a source are fanned out concurrently
+by the adapters themselves.
+
+Usage::
+
+    python -m app.scheduler                   # all sources, forever
+    python -m app.scheduler github hacker_news
+    python -m app.scheduler --once            # run each source once
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+from .db import SNAPSHOT_DIR, SessionLocal, init_schema
+from .ingest import check_links, ingest_source, load_adapters
+from .models import SourceKind
+from .snapshot import prepare_staging, publish
+from .sources.base import QuotaExhausted, SourceAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class SourceSchedule:
+    """Tracks when a single source is next due."""
+
+    def __init__(self, key: str, adapter: SourceAdapter) -> None:
+        self.key = key
+        self.adapter = adapter
+        # Run every source once on startup
+        self.next_run = time.monotonic()
+
+    def delay(self) -> float:
+        """Return seconds until the source may run, honouring its quota."""
+        due = max(self.next_run - time.monotonic(), 0.0)
+        return max(due, self.adapter.quota.reset_in())
+
+
+async def run_source(schedule: SourceSchedule) -> None:
+    """Ingest one source, check its links and compute its next run."""
+    key = schedule.key
+    started = time.monotonic()
+    schedule.next_run = started + schedule.adapter.config.interval
+    try:
+        with SessionLocal() as db:
+            count = await ingest_source(db, key, schedule.adapter)
+        await check_links([SourceKind(key)])
+        if SNAPSHOT_DIR:
+            publish()
+    except QuotaExhausted as exc:
+        logger.warning("%s: %s", key, exc)
+        schedule.next_run = max(schedule.next_run, started + exc.retry_after)
+        if SNAPSHOT_DIR:
+            # Serve what was discovered before the quota ran out
+            try:
+                publish()
+            except Exception:
+                logger.exception("%s: publish failed", key)
+        return
+    except Exception:
+        # A failing source must not take the others down with it
+        logger.exception("%s: run failed", key)
+        return
+    logger.info(
+        "%s: %d items in %.1fs", key, count, time.monotonic() - started
+    )
+
+
+async def run_scheduler(
+    keys: Optional[List[str]] = None, once: bool = False
+) -> None:
+    """Run the registered sources on their intervals.
+
+    Args:
+        keys: Source keys to schedule; all registered adapters by default.
+        once: Run each source a single time and return.
+    """
+    if SNAPSHOT_DIR:
+        prepare_staging()
+    init_schema()
+    adapters: Dict[str, SourceAdapter] = load_adapters(keys)
+    schedules = [SourceSchedule(key, a) for key, a in adapters.items()]
+    if once:
+        for schedule in schedules:
+            await run_source(schedule)
+        return
+    while True:
+        schedule = min(schedules, key=lambda s: s.delay())
+        delay = schedule.delay()
+        if delay:
+            await asyncio.sleep(delay)
+        await run_source(schedule)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(prog="python -m app.scheduler")
+    parser.add_argument("sources", nargs="*", help="source keys (default: all)")
+    parser.add_argument("--once", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_scheduler(args.sources or None, once=args.once))
+
+
+if __name__ == "__main__":
+    main()
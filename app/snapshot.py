@@ -0,0 +1,370 @@
+"""Read-only database snapshots for contention-free serving.
+
+With ``SNAPSHOT_DIR`` set, ingest and maintenance write to
+``SNAPSHOT_DIR/staging.db`` (see :mod:`app.db`) while the API never touches
+that file. When a run finishes, :func:`publish` analyzes the staging
+database and writes a compacted, immutable copy next to it with
+``VACUUM INTO``. The ``CURRENT`` file, replaced atomically, names the
+snapshot to serve::
+
+    SNAPSHOT_DIR/
+        staging.db
+        echolove-20250101T000000000000Z.db   (read-only)
+        CURRENT                              -> "echolove-...db"
+
+API workers open the current snapshot read-only, immutable and memory
+mapped, so concurrent readers take no locks and share the OS page cache.
+Each worker notices a new ``CURRENT`` (checked at most once per
+``SNAPSHOT_CHECK_INTERVAL`` seconds, or immediately after ``SIGHUP``) and
+switches engines without a restart; requests already in flight finish on
+the snapshot they started with. Until the first publish the API answers
+503 (:class:`SnapshotUnavailable`).
+
+Usage::
+
+    python -m app.snapshot publish [--prewarm]
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import signal
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
+from .db import (
+    SEED_DATABASE_URL,
+    SNAPSHOT_DIR,
+    engine as staging_engine,
+    init_schema,
+    verify_schema,
+)
+
+# Name of the pointer file naming the current snapshot
+POINTER = "CURRENT"
+
+# Number of published snapshots kept on disk, including the current one
+KEEP_SNAPSHOTS = int(os.getenv("SNAPSHOT_KEEP", "3"))
+
+# Read the whole snapshot once after publishing to load it into the page cache
+PREWARM = os.getenv("SNAPSHOT_PREWARM", "0") == "1"
+
+# Seconds between checks of the pointer file in API workers
+CHECK_INTERVAL = float(os.getenv("SNAPSHOT_CHECK_INTERVAL", "1.0"))
+
+# Bytes of each snapshot mapped into memory by readers
+MMAP_SIZE = int(os.getenv("SNAPSHOT_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotUnavailable(RuntimeError):
+    """Raised when the API is asked for data before the first publish."""
+
+
+def staging_path(directory: str = SNAPSHOT_DIR) -> str:
+    """Return the path of the staging database in ``directory``."""
+    return os.path.join(os.path.abspath(directory), "staging.db")
+
+
+def current_snapshot(directory: str = SNAPSHOT_DIR) -> Optional[str]:
+    """Return the path of the published snapshot, or None if there is none."""
+    try:
+        with open(os.path.join(directory, POINTER), encoding="utf-8") as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(os.path.abspath(directory), name) if name else None
+
+
+def _sqlite_path(url: str) -> Optional[str]:
+    """Return the file path of a SQLite URL, or None for other databases."""
+    if not url:
+        return None
+    parsed = make_url(url)
+    if not parsed.drivername.startswith("sqlite"):
+        return None
+    if not parsed.database or parsed.database == ":memory:":
+        return None
+    return os.path.abspath(parsed.database)
+
+
+def _is_seeded(path: str) -> bool:
+    """Return True if ``path`` is a SQLite database that has the tables.
+
+    Merely connecting to a missing file makes SQLite create it empty, e.g.
+    when a maintenance run opens the staging engine before the first
+    publish, so an existing file alone does not mean it was seeded.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return False
+    conn = sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True)
+    try:
+        found = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tools'"
+        ).fetchone()
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        conn.close()
+    return found is not None
+
+
+def prepare_staging(
+    directory: str = SNAPSHOT_DIR, seed_url: str = SEED_DATABASE_URL
+) -> None:
+    """Seed a missing, empty or schema-less staging database.
+
+    The staging file is copied from the current snapshot, so a fresh
+    container continues from the last published data. If nothing has been
+    published yet, it is copied from the SQLite database at ``seed_url``
+    (the configured ``DATABASE_URL``), so enabling snapshots on an existing
+    deployment keeps the data served so far.
+    """
+    staging = staging_path(directory)
+    if _is_seeded(staging):
+        return
+    os.makedirs(directory, exist_ok=True)
+    current = current_snapshot(directory)
+    if current and os.path.exists(current):
+        shutil.copyfile(current, staging)
+        # Snapshots are published read-only; the staging copy must be writable
+        os.chmod(staging, 0o644)
+        return
+    seed = _sqlite_path(seed_url)
+    if seed and seed != staging and os.path.exists(seed):
+        # The backup API takes a consistent copy even while the file is in use
+        source = sqlite3.connect(f"file:{quote(seed)}?mode=ro", uri=True)
+        target = sqlite3.connect(staging)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+
+def prewarm(path: str, chunk_size: int = 1024 * 1024) -> None:
+    """Read a file sequentially so that its pages land in the OS page cache."""
+    with open(path, "rb", buffering=0) as f:
+        while f.read(chunk_size):
+            pass
+
+
+def _fsync_dir(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _prune(directory: str, keep: int) -> None:
+    """Delete old snapshots beyond the ``keep`` most recent ones.
+
+    Workers still reading a deleted snapshot keep their open file handles,
+    so this is safe on POSIX file systems.
+    """
+    current = current_snapshot(directory)
+    names = sorted(
+        n
+        for n in os.listdir(directory)
+        if n.startswith("echolove-") and n.endswith(".db")
+    )
+    for name in names[: max(len(names) - keep, 0)]:
+        path = os.path.join(os.path.abspath(directory), name)
+        if path != current:
+            os.remove(path)
+
+
+def publish(
+    directory: str = SNAPSHOT_DIR,
+    prewarm_cache: bool = PREWARM,
+    keep: int = KEEP_SNAPSHOTS,
+    bind: Engine = staging_engine,
+) -> str:
+    """Publish the staging database as a new immutable snapshot.
+
+    Returns the path of the new snapshot.
+    """
+    if not directory:
+        raise RuntimeError("SNAPSHOT_DIR is not set")
+    directory = os.path.abspath(directory)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    name = f"echolove-{stamp}.db"
+    path = os.path.join(directory, name)
+    tmp = path + ".tmp"
+
+    # ANALYZE first so the planner statistics are copied into the snapshot;
+    # VACUUM INTO writes a defragmented, consistent copy without blocking
+    # readers of the staging file for longer than one read transaction.
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+        conn.execute(text("VACUUM INTO :path"), {"path": tmp})
+
+    with open(tmp, "rb") as f:
+        os.fsync(f.fileno())
+    os.chmod(tmp, 0o444)
+    os.replace(tmp, path)
+    if prewarm_cache:
+        prewarm(path)
+
+    # Swap the pointer atomically; readers see either the old or the new name
+    pointer_tmp = os.path.join(directory, POINTER + ".tmp")
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        f.write(name)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(pointer_tmp, os.path.join(directory, POINTER))
+    _fsync_dir(directory)
+
+    _prune(directory, keep)
+    return path
+
+
+def _reader_engine(path: str) -> Engine:
+    """Create a read-only, memory-mapped engine for a snapshot file."""
+    # immutable=1 tells SQLite the file never changes, so it skips locking
+    # and change detection entirely
+    url = f"sqlite:///file:{quote(path)}?mode=ro&immutable=1&uri=true"
+    reader = create_engine(
+        url,
+        echo=False,
+        future=True,
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(reader, "connect")
+    def _configure(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        cursor.execute("PRAGMA query_only = 1")
+        cursor.close()
+
+    return reader
+
+
+class SnapshotReader:
+    """Serves sessions from the current snapshot and follows new publishes."""
+
+    def __init__(
+        self, directory: str, check_interval: float = CHECK_INTERVAL
+    ) -> None:
+        self.directory = directory
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._pointer_key: Optional[Tuple[int, int]] = None
+        self._checked = 0.0
+        self._force = True
+        self._path: Optional[str] = None
+        self._engine: Optional[Engine] = None
+        self._sessionmaker: Optional[sessionmaker] = None
+
+    def request_check(self) -> None:
+        """Make the next request re-read the pointer file."""
+        self._force = True
+
+    def install_signal_handler(self) -> None:
+        """Re-read the pointer file on ``SIGHUP``."""
+        try:
+            signal.signal(signal.SIGHUP, lambda signum, frame: self.request_check())
+        except (AttributeError, ValueError):
+            # No SIGHUP on this platform, or not called from the main thread
+            pass
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if not self._force and now - self._checked < self.check_interval:
+            return
+        with self._lock:
+            self._checked = now
+            self._force = False
+            try:
+                st = os.stat(os.path.join(self.directory, POINTER))
+            except FileNotFoundError:
+                return
+            # os.replace gives the pointer a new inode on every publish
+            key = (st.st_ino, st.st_mtime_ns)
+            if key == self._pointer_key:
+                return
+            self._pointer_key = key
+            path = current_snapshot(self.directory)
+            if not path or path == self._path:
+                return
+            new = _reader_engine(path)
+            try:
+                verify_schema(new)
+            except RuntimeError:
+                # Keep serving the previous snapshot rather than a broken one
+                logger.exception("Not switching to snapshot %s", path)
+                new.dispose()
+                return
+            old = self._engine
+            self._engine = new
+            self._sessionmaker = sessionmaker(
+                bind=self._engine,
+                autoflush=False,
+                autocommit=False,
+                future=True,
+            )
+            self._path = path
+            if old is not None:
+                # Checked-out connections finish their request and are then
+                # discarded; idle ones are closed right away
+                old.dispose()
+
+    def available(self) -> bool:
+        """Return True once a snapshot can be served."""
+        self._refresh()
+        return self._engine is not None
+
+    def engine(self) -> Engine:
+        """Return the engine for the current snapshot.
+
+        Raises:
+            SnapshotUnavailable: If nothing has been published yet.
+        """
+        self._refresh()
+        if self._engine is None:
+            raise SnapshotUnavailable(
+                f"No snapshot published in {self.directory}; "
+                "run `python -m app.snapshot publish`"
+            )
+        return self._engine
+
+    def get_db(self) -> Iterator[Session]:
+        """FastAPI dependency yielding a session on the current snapshot."""
+        self.engine()
+        db = self._sessionmaker()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+# Reader used by the API when snapshots are enabled
+reader = SnapshotReader(SNAPSHOT_DIR) if SNAPSHOT_DIR else None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(prog="python -m app.snapshot")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_publish = sub.add_parser("publish", help="publish the staging database")
+    p_publish.add_argument("--prewarm", action="store_true", default=PREWARM)
+    args = parser.parse_args(argv)
+    if args.command == "publish":
+        # Also serves as the first publish of an existing deployment
+        prepare_staging()
+        init_schema()
+        print(f"published {publish(prewarm_cache=args.prewarm)}")
+
+
+if __name__ == "__main__":
+    main()
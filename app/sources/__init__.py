@@ -15,5 +15,9 @@ generator. Adapters included:
   ranges and topics, representing under‑the‑radar projects.
 
 To add a new source, create a module implementing the ``SourceAdapter``
-class and update the list in ``app/ingest.py``.
+class, decorate it with ``register_adapter`` from ``registry.py`` and list
+the module in ``registry.BUILTIN_MODULES``; external packages can instead
+expose the class through the ``echolove.adapters`` entry-point group. Each
+adapter takes an ``AdapterConfig`` subclass holding its settings, run
+interval and API quota.
 """
\ No newline at end of file
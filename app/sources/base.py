@@ -1,7 +1,20 @@
 """Base classes for source adapters."""
 
+import asyncio
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import AsyncIterator, Dict, Any
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Type,
+)
 
 
 class DiscoveredTool(Dict[str, Any]):
@@ -23,10 +36,169 @@ class DiscoveredTool(Dict[str, Any]):
     pass
 
 
+class QuotaExhausted(Exception):
+    """Raised when a source's API quota does not allow another request."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"API quota exhausted; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class Quota:
+    """Sliding-window request budget for a single source API.
+
+    Allows at most ``limit`` requests per ``window`` seconds. ``acquire``
+    waits for a free slot when one opens up within ``max_wait`` seconds and
+    raises :class:`QuotaExhausted` otherwise, so short per-minute limits are
+    paced while long daily limits end the run early. A ``limit`` of ``None``
+    means the source is not rate limited.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int],
+        window: float,
+        max_wait: float = 60.0,
+    ) -> None:
+        self.limit = limit
+        self.window = window
+        self.max_wait = max_wait
+        self._calls: Deque[float] = deque()
+        # Created lazily so the lock binds to the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _prune(self, now: float) -> None:
+        while self._calls and self._calls[0] <= now - self.window:
+            self._calls.popleft()
+
+    def remaining(self) -> Optional[int]:
+        """Return the number of requests left in the current window."""
+        if self.limit is None:
+            return None
+        self._prune(time.monotonic())
+        return max(self.limit - len(self._calls), 0)
+
+    def reset_in(self) -> float:
+        """Return the number of seconds until the next slot frees up."""
+        if self.limit is None or self.remaining():
+            return 0.0
+        if not self._calls:
+            # A zero limit never frees up
+            return float("inf")
+        return max(self._calls[0] + self.window - time.monotonic(), 0.0)
+
+    def sync(self, remaining: int) -> None:
+        """Align the local budget with a remaining count reported by the API."""
+        if self.limit is None:
+            return
+        now = time.monotonic()
+        self._prune(now)
+        while self.limit - len(self._calls) > remaining:
+            self._calls.append(now)
+
+    async def acquire(self) -> None:
+        """Consume one request from the budget, waiting if allowed."""
+        if self.limit is None:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            wait = self.reset_in()
+            if wait > self.max_wait:
+                raise QuotaExhausted(wait)
+            if wait:
+                await asyncio.sleep(wait)
+            self._prune(time.monotonic())
+            self._calls.append(time.monotonic())
+
+
+class AdapterConfig:
+    """Configuration shared by all adapters.
+
+    Args:
+        interval: Seconds between scheduled runs of the source.
+        quota_limit: Requests allowed per ``quota_window`` (``None`` for
+            no limit).
+        quota_window: Length of the quota window in seconds.
+        concurrency: Maximum number of queries fanned out at once.
+    """
+
+    def __init__(
+        self,
+        interval: float = 3600.0,
+        quota_limit: Optional[int] = None,
+        quota_window: float = 60.0,
+        concurrency: int = 4,
+    ) -> None:
+        self.interval = interval
+        self.quota_limit = quota_limit
+        self.quota_window = quota_window
+        self.concurrency = concurrency
+
+    @classmethod
+    def from_env(cls) -> "AdapterConfig":
+        """Build the configuration from environment variables."""
+        return cls()
+
+
+def env_list(name: str, default: str = "") -> List[str]:
+    """Read a semicolon-separated list from an environment variable."""
+    return [v.strip() for v in os.getenv(name, default).split(";") if v.strip()]
+
+
+async def merge(
+    streams: Iterable[AsyncIterator[DiscoveredTool]], concurrency: int = 4
+) -> AsyncIterator[DiscoveredTool]:
+    """Run several discovery streams concurrently and yield their items.
+
+    At most ``concurrency`` streams run at the same time. If a stream fails,
+    the remaining ones are cancelled and the error is re-raised.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    finished = object()
+
+    async def pump(stream: AsyncIterator[DiscoveredTool]) -> None:
+        try:
+            async with semaphore:
+                async for item in stream:
+                    await queue.put(item)
+        except Exception as exc:
+            await queue.put(exc)
+        finally:
+            await queue.put(finished)
+
+    tasks = [asyncio.ensure_future(pump(s)) for s in streams]
+    pending = len(tasks)
+    try:
+        while pending:
+            item = await queue.get()
+            if item is finished:
+                pending -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 class SourceAdapter(ABC):
-    """Abstract base class for all source adapters."""
+    """Abstract base class for all source adapters.
+
+    Subclasses set ``config_class`` to their own :class:`AdapterConfig`
+    subclass. The adapter's :class:`Quota` is built from that configuration
+    and must be acquired before every request to the source API.
+    """
+
+    config_class: Type[AdapterConfig] = AdapterConfig
+
+    def __init__(self, config: Optional[AdapterConfig] = None) -> None:
+        self.config = config or self.config_class.from_env()
+        self.quota = Quota(self.config.quota_limit, self.config.quota_window)
 
     @abstractmethod
     async def discover(self) -> AsyncIterator[DiscoveredTool]:
         """Yield normalized tools discovered from this source."""
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
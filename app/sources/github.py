@@ -3,41 +3,102 @@
 import asyncio
 import datetime as dt
 import os
-from typing import AsyncIterator
+from typing import AsyncIterator, List, Optional
 from urllib.parse import urlencode
-from .base import SourceAdapter, DiscoveredTool
+from .base import AdapterConfig, SourceAdapter, DiscoveredTool, env_list, merge
+from .registry import register_adapter
 from ..utils import client
 
 # GitHub Search API endpoint
 BASE = "https://api.github.com/search/repositories"
 
-# Configuration from environment variables
-TOKEN = os.getenv("GITHUB_TOKEN", "")
-MIN_STARS = int(os.getenv("MIN_GITHUB_STARS", "10"))
-MAX_STARS = int(os.getenv("MAX_GITHUB_STARS", "600"))
-ADDED = os.getenv("GITHUB_QUERY_ADDITIONS", "").strip()
+# Search requests allowed per minute without and with a token
+QUOTA_ANONYMOUS = 10
+QUOTA_WITH_TOKEN = 30
 
-# Only include repositories pushed within the last year
-PUSHED = (
-    dt.datetime.utcnow() - dt.timedelta(days=365)
-).date().isoformat()
 
+class GitHubConfig(AdapterConfig):
+    """Configuration for :class:`GitHubAdapter`.
 
+    Each topic becomes its own search query, fanned out concurrently within
+    the per-minute search quota. Searches are the most expensive source, so
+    it runs once a day by default.
+    """
+
+    def __init__(
+        self,
+        token: str = "",
+        min_stars: int = 10,
+        max_stars: int = 600,
+        query_additions: str = "",
+        topics: Optional[List[str]] = None,
+        pushed_within_days: int = 365,
+        pages: int = 1,
+        interval: float = 86400.0,
+        quota_limit: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        if quota_limit is None:
+            quota_limit = QUOTA_WITH_TOKEN if token else QUOTA_ANONYMOUS
+        super().__init__(
+            interval=interval,
+            quota_limit=quota_limit,
+            quota_window=60.0,
+            **kwargs,
+        )
+        self.token = token
+        self.min_stars = min_stars
+        self.max_stars = max_stars
+        self.query_additions = query_additions
+        self.topics = topics or []
+        self.pushed_within_days = pushed_within_days
+        self.pages = pages
+
+    @classmethod
+    def from_env(cls) -> "GitHubConfig":
+        return cls(
+            token=os.getenv("GITHUB_TOKEN", ""),
+            min_stars=int(os.getenv("MIN_GITHUB_STARS", "10")),
+            max_stars=int(os.getenv("MAX_GITHUB_STARS", "600")),
+            query_additions=os.getenv("GITHUB_QUERY_ADDITIONS", "").strip(),
+            topics=env_list("GITHUB_TOPICS"),
+            pages=int(os.getenv("GITHUB_PAGES", "1")),
+            interval=float(os.getenv("GITHUB_INTERVAL", "86400")),
+        )
+
+
+@register_adapter("github")
 class GitHubAdapter(SourceAdapter):
     """Searches GitHub for repositories that fit a certain profile."""
 
-    def __init__(self, pages: int = 1) -> None:
-        self.pages = pages
+    config_class = GitHubConfig
+
+    def queries(self) -> List[str]:
+        """Build one search query per configured topic."""
+        cfg = self.config
+        # Only include repositories pushed within the configured period,
+        # computed per run so long-lived processes don't use a stale date
+        pushed = (
+            dt.datetime.now(dt.timezone.utc)
+            - dt.timedelta(days=cfg.pushed_within_days)
+        ).date().isoformat()
+        base = [f"stars:{cfg.min_stars}..{cfg.max_stars}", f"pushed:>{pushed}"]
+        if cfg.query_additions:
+            base.append(f"({cfg.query_additions})")
+        if not cfg.topics:
+            return [" ".join(base)]
+        return [" ".join(base + [f"topic:{topic}"]) for topic in cfg.topics]
 
     async def discover(self) -> AsyncIterator[DiscoveredTool]:
-        # Build the search query
-        q_parts = [f"stars:{MIN_STARS}..{MAX_STARS}", f"pushed:>{PUSHED}"]
-        if ADDED:
-            q_parts.append(f"({ADDED})")
-        q = " ".join(q_parts)
+        streams = [self._search(q) for q in self.queries()]
+        async for item in merge(streams, self.config.concurrency):
+            yield item
+
+    async def _search(self, q: str) -> AsyncIterator[DiscoveredTool]:
         # Authorization header if a token is provided
-        headers = {"Authorization": f"Bearer {TOKEN}"} if TOKEN else {}
-        for page in range(1, self.pages + 1):
+        token = self.config.token
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        for page in range(1, self.config.pages + 1):
             qs = {
                 "q": q,
                 "sort": "stars",
@@ -46,10 +107,14 @@ class GitHubAdapter(SourceAdapter):
                 "page": page,
             }
             url = f"{BASE}?{urlencode(qs)}"
+            await self.quota.acquire()
             async with client() as c:
                 r = await c.get(url, headers=headers)
                 r.raise_for_status()
                 data = r.json()
+            remaining = r.headers.get("X-RateLimit-Remaining")
+            if remaining is not None:
+                self.quota.sync(int(remaining))
             for repo in data.get("items", []):
                 topics = (
                     ",".join(repo.get("topics", []))
@@ -69,4 +134,4 @@ class GitHubAdapter(SourceAdapter):
                         "published_at": None,
                     },
                 )
-                await asyncio.sleep(0.1)
\ No newline at end of file
+                await asyncio.sleep(0.1)
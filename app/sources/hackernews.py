@@ -2,8 +2,10 @@
 
 import asyncio
 import datetime as dt
+import os
 from typing import AsyncIterator
-from .base import SourceAdapter, DiscoveredTool
+from .base import AdapterConfig, SourceAdapter, DiscoveredTool
+from .registry import register_adapter
 from ..utils import client
 
 # Official Hacker News Firebase API endpoints
@@ -11,13 +13,35 @@ from ..utils import client
 BASE = "https://hacker-news.firebaseio.com/v0"
 
 
+class HackerNewsConfig(AdapterConfig):
+    """Configuration for :class:`HackerNewsAdapter`.
+
+    The Firebase API has no published rate limit and each run is cheap, so
+    by default the source runs every 30 minutes without a quota.
+    """
+
+    def __init__(
+        self, max_items: int = 40, interval: float = 1800.0, **kwargs
+    ) -> None:
+        super().__init__(interval=interval, **kwargs)
+        self.max_items = max_items
+
+    @classmethod
+    def from_env(cls) -> "HackerNewsConfig":
+        return cls(
+            max_items=int(os.getenv("HACKERNEWS_MAX_ITEMS", "40")),
+            interval=float(os.getenv("HACKERNEWS_INTERVAL", "1800")),
+        )
+
+
+@register_adapter("hacker_news")
 class HackerNewsAdapter(SourceAdapter):
     """Fetches recent 'Show HN' stories and returns potential tools."""
 
-    def __init__(self, max_items: int = 50) -> None:
-        self.max_items = max_items
+    config_class = HackerNewsConfig
 
     async def _get_json(self, url: str):
+        await self.quota.acquire()
         async with client() as c:
             r = await c.get(url)
             r.raise_for_status()
@@ -26,7 +50,7 @@ class HackerNewsAdapter(SourceAdapter):
     async def discover(self) -> AsyncIterator[DiscoveredTool]:
         # Get the list of Show HN story IDs
         ids = await self._get_json(f"{BASE}/showstories.json")
-        ids = ids[: self.max_items]
+        ids = ids[: self.config.max_items]
         for iid in ids:
             # Fetch each item individually
             item = await self._get_json(f"{BASE}/item/{iid}.json")
@@ -52,4 +76,4 @@ class HackerNewsAdapter(SourceAdapter):
                 },
             )
             # Small delay between requests to be polite
-            await asyncio.sleep(0.1)
\ No newline at end of file
+            await asyncio.sleep(0.1)
@@ -0,0 +1,90 @@
+"""Registry of source adapters.
+
+Built-in adapters register themselves with :func:`register_adapter` when
+their module is imported. Third-party packages can contribute adapters
+through the ``echolove.adapters`` entry-point group, e.g. in their
+``pyproject.toml``::
+
+    [project.entry-points."echolove.adapters"]
+    hacker_news = "my_package.adapters:FasterHackerNewsAdapter"
+
+The entry-point name is the source key; an entry point with the same name
+as a built-in replaces it. Only keys that are ``SourceKind`` values can be
+ingested (see ``app.ingest.load_adapters``); others are skipped.
+Modules are only imported when the registry is first queried, so importing
+this module does not pull in httpx.
+"""
+
+import importlib
+from importlib.metadata import entry_points
+from typing import Callable, Dict, List, Optional, Type
+from .base import SourceAdapter
+
+# Entry-point group scanned for third-party adapters
+ENTRY_POINT_GROUP = "echolove.adapters"
+
+# Modules providing the built-in adapters, imported on first use
+BUILTIN_MODULES = (
+    "app.sources.hackernews",
+    "app.sources.stackexchange",
+    "app.sources.github",
+)
+
+_REGISTRY: Dict[str, Type[SourceAdapter]] = {}
+_loaded = False
+
+
+def register_adapter(
+    key: str,
+) -> Callable[[Type[SourceAdapter]], Type[SourceAdapter]]:
+    """Class decorator registering an adapter under a source key."""
+
+    def decorator(cls: Type[SourceAdapter]) -> Type[SourceAdapter]:
+        _REGISTRY[key] = cls
+        return cls
+
+    return decorator
+
+
+def _entry_points() -> list:
+    """Return the entry points of the adapter group on Python 3.9 and later."""
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return list(eps.select(group=ENTRY_POINT_GROUP))
+    # Python < 3.10 returns a dict of groups
+    return list(eps.get(ENTRY_POINT_GROUP, []))
+
+
+def _load() -> None:
+    """Import built-in adapters and entry points once."""
+    global _loaded
+    if _loaded:
+        return
+    for module in BUILTIN_MODULES:
+        importlib.import_module(module)
+    for ep in _entry_points():
+        _REGISTRY[ep.name] = ep.load()
+    _loaded = True
+
+
+def available_adapters() -> Dict[str, Type[SourceAdapter]]:
+    """Return all registered adapter classes keyed by source key."""
+    _load()
+    return dict(_REGISTRY)
+
+
+def create_adapters(keys: Optional[List[str]] = None) -> Dict[str, SourceAdapter]:
+    """Instantiate adapters with their environment configuration.
+
+    Args:
+        keys: Source keys to create; all registered adapters when omitted.
+
+    Raises:
+        KeyError: If a requested key has no registered adapter.
+    """
+    registry = available_adapters()
+    keys = list(registry) if keys is None else keys
+    missing = [k for k in keys if k not in registry]
+    if missing:
+        raise KeyError(f"No adapter registered for: {', '.join(missing)}")
+    return {key: registry[key]() for key in keys}
@@ -2,72 +2,143 @@
 
 import asyncio
 import datetime as dt
-from typing import AsyncIterator
+import time
+from typing import AsyncIterator, List, Optional
 from urllib.parse import urlencode
 import os
-from .base import SourceAdapter, DiscoveredTool
+from .base import AdapterConfig, SourceAdapter, DiscoveredTool, env_list, merge
+from .registry import register_adapter
 from ..utils import client
 
 # Stack Exchange API v2.3 endpoint
 API = "https://api.stackexchange.com/2.3/search"
 
-# Configurable via environment variables
-SITES = os.getenv("STACKEXCHANGE_SITES", "stackoverflow").split(";")
-KEY = os.getenv("STACKEXCHANGE_KEY", "")
+# Daily request quota per IP without and with an application key
+QUOTA_ANONYMOUS = 300
+QUOTA_WITH_KEY = 10000
 
 
+class StackExchangeConfig(AdapterConfig):
+    """Configuration for :class:`StackExchangeAdapter`.
+
+    The API enforces a daily quota shared by all sites, so the source runs
+    every six hours by default and stops early once the quota is spent.
+    """
+
+    def __init__(
+        self,
+        sites: Optional[List[str]] = None,
+        pages: int = 1,
+        key: str = "",
+        interval: float = 21600.0,
+        quota_limit: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        if quota_limit is None:
+            quota_limit = QUOTA_WITH_KEY if key else QUOTA_ANONYMOUS
+        super().__init__(
+            interval=interval,
+            quota_limit=quota_limit,
+            quota_window=86400.0,
+            **kwargs,
+        )
+        self.sites = sites or ["stackoverflow"]
+        self.pages = pages
+        self.key = key
+
+    @classmethod
+    def from_env(cls) -> "StackExchangeConfig":
+        return cls(
+            sites=env_list("STACKEXCHANGE_SITES", "stackoverflow"),
+            pages=int(os.getenv("STACKEXCHANGE_PAGES", "1")),
+            key=os.getenv("STACKEXCHANGE_KEY", ""),
+            interval=float(os.getenv("STACKEXCHANGE_INTERVAL", "21600")),
+        )
+
+
+@register_adapter("stack_exchange")
 class StackExchangeAdapter(SourceAdapter):
     """Searches Stack Exchange for questions mentioning tools."""
 
-    def __init__(self, pages: int = 1) -> None:
-        self.pages = pages
+    config_class = StackExchangeConfig
+
+    def __init__(self, config: Optional[StackExchangeConfig] = None) -> None:
+        super().__init__(config)
+        # Monotonic time before which /search must not be called again. The
+        # API's backoff applies to the method, not to one site, so it is
+        # shared by the concurrent site queries.
+        self._backoff_until = 0.0
+
+    async def _wait_for_backoff(self) -> None:
+        """Sleep until the last ``backoff`` requested by the API has passed."""
+        while True:
+            delay = self._backoff_until - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
 
     async def discover(self) -> AsyncIterator[DiscoveredTool]:
+        # Query all configured sites concurrently
+        streams = [self._discover_site(site) for site in self.config.sites]
+        async for item in merge(streams, self.config.concurrency):
+            yield item
+
+    async def _discover_site(self, site: str) -> AsyncIterator[DiscoveredTool]:
         tags = ["tool", "open-source", "productivity"]
-        for site in SITES:
-            page = 1
-            for _ in range(self.pages):
-                # Build query params
-                qs = {
-                    "order": "desc",
-                    "sort": "creation",
-                    "site": site,
-                    "intitle": "recommendation OR tool",
-                    "tagged": ";".join(tags),
-                    "filter": "default",
-                    "pagesize": 20,
-                    "page": page,
-                }
-                if KEY:
-                    qs["key"] = KEY
-                url = f"{API}?{urlencode(qs)}"
-                async with client() as c:
-                    r = await c.get(url)
-                    r.raise_for_status()
-                    data = r.json()
-                for q in data.get("items", []):
-                    title = q.get("title")
-                    link = q.get("link")
-                    if not title or not link:
-                        continue
-                    published = dt.datetime.fromtimestamp(
-                        q.get("creation_date", 0), tz=dt.timezone.utc
-                    )
-                    yield DiscoveredTool(
-                        name=title[:100],
-                        description=f"Discussed on {site}",
-                        homepage=None,
-                        repo_url=None,
-                        language=None,
-                        tags=[site, "stackexchange"],
-                        review={
-                            "source_url": link,
-                            "snippet": title,
-                            "published_at": published.isoformat(),
-                        },
-                    )
-                    await asyncio.sleep(0.1)
-                # Stop if there are no more pages
-                if not data.get("has_more"):
-                    break
-                page += 1
\ No newline at end of file
+        page = 1
+        for _ in range(self.config.pages):
+            # Build query params
+            qs = {
+                "order": "desc",
+                "sort": "creation",
+                "site": site,
+                "intitle": "recommendation OR tool",
+                "tagged": ";".join(tags),
+                "filter": "default",
+                "pagesize": 20,
+                "page": page,
+            }
+            if self.config.key:
+                qs["key"] = self.config.key
+            url = f"{API}?{urlencode(qs)}"
+            await self._wait_for_backoff()
+            await self.quota.acquire()
+            async with client() as c:
+                r = await c.get(url)
+                r.raise_for_status()
+                data = r.json()
+            # Trust the server's view of the remaining daily quota
+            if "quota_remaining" in data:
+                self.quota.sync(data["quota_remaining"])
+            # The API asks clients to wait before hitting the same method
+            # again; hold back the other sites' queries as well
+            if data.get("backoff"):
+                self._backoff_until = max(
+                    self._backoff_until, time.monotonic() + data["backoff"]
+                )
+            for q in data.get("items", []):
+                title = q.get("title")
+                link = q.get("link")
+                if not title or not link:
+                    continue
+                published = dt.datetime.fromtimestamp(
+                    q.get("creation_date", 0), tz=dt.timezone.utc
+                )
+                yield DiscoveredTool(
+                    name=title[:100],
+                    description=f"Discussed on {site}",
+                    homepage=None,
+                    repo_url=None,
+                    language=None,
+                    tags=[site, "stackexchange"],
+                    review={
+                        "source_url": link,
+                        "snippet": title,
+                        "published_at": published.isoformat(),
+                    },
+                )
+                await asyncio.sleep(0.1)
+            # Stop if there are no more pages
+            if not data.get("has_more"):
+                break
+            page += 1
@@ -4,8 +4,10 @@ import asyncio
 import hashlib
 from contextlib import asynccontextmanager
 import re
-from typing import AsyncGenerator
-import httpx
+from typing import TYPE_CHECKING, AsyncGenerator
+
+if TYPE_CHECKING:
+    import httpx
 
 
 # Default User-Agent for outbound HTTP requests
@@ -26,11 +28,14 @@ def slugify(name: str) -> str:
 
 
 @asynccontextmanager
-async def client() -> AsyncGenerator[httpx.AsyncClient, None]:
+async def client() -> AsyncGenerator["httpx.AsyncClient", None]:
     """Provide a configured AsyncClient for HTTP requests.
 
     This helper centralizes the User-Agent header and timeout settings.
+    httpx is imported lazily so that only the ingest process loads it.
     """
+    import httpx
+
     headers = {"User-Agent": USER_AGENT}
     timeout = httpx.Timeout(15.0, connect=10.0)
     async with httpx.AsyncClient(
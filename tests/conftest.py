@@ -0,0 +1,19 @@
+"""Shared fixtures for the ECHOLOVE test suite."""
+
+import pytest
+from sqlalchemy import create_engine
+from app.db import Base
+from app import models  # noqa: F401  (registers the tables on Base)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine for a fresh SQLite database with all tables created."""
+    eng = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        future=True,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=eng)
+    yield eng
+    eng.dispose()
@@ -0,0 +1,15 @@
+"""Cold-start budget test for the API process."""
+
+from app import coldstart
+
+
+def test_cold_start_within_budget():
+    result = coldstart.measure()
+    total = result["import_ms"] + result["first_request_ms"]
+
+    assert result["status"] == 200
+    assert result["ingest_modules"] == []
+    assert total <= coldstart.BUDGET_MS, (
+        f"import + first request took {total:.0f} ms, "
+        f"budget is {coldstart.BUDGET_MS:.0f} ms"
+    )
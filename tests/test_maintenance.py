@@ -0,0 +1,153 @@
+"""Tests for the retention, archival and vacuum job."""
+
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session, sessionmaker
+from app import ingest
+from app.maintenance import RetentionPolicy, prune, restore
+from app.models import Origin, Review, SourceKind, Tool
+
+NOW = datetime(2025, 1, 1)
+
+
+def _add_tool(db: Session, slug: str) -> Tool:
+    tool = Tool(slug=slug, name=slug, created_at=NOW, updated_at=NOW)
+    db.add(tool)
+    db.flush()
+    db.add(
+        Origin(
+            tool_id=tool.id,
+            source_kind=SourceKind.GITHUB,
+            raw_ref=slug,
+            source_url=f"https://example.com/{slug}",
+            discovered_at=NOW,
+        )
+    )
+    return tool
+
+
+def _add_review(db: Session, tool: Tool, checked: datetime, status="active"):
+    db.add(
+        Review(
+            tool_id=tool.id,
+            source_kind=SourceKind.GITHUB,
+            source_url=f"https://example.com/{tool.slug}",
+            snippet="snippet",
+            last_checked_at=checked,
+            status=status,
+        )
+    )
+
+
+def _count(engine, model) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(model)).scalar()
+
+
+def test_keeps_latest_snapshots_per_link(engine, tmp_path):
+    with Session(engine) as db:
+        tool = _add_tool(db, "a")
+        for day in range(5):
+            _add_review(db, tool, NOW + timedelta(days=day))
+        db.commit()
+
+    policy = RetentionPolicy(keep_snapshots=2, archived_days=0)
+    archive = str(tmp_path / "archive.ndjson.gz")
+    assert prune(policy, archive, dry_run=True, engine=engine)["reviews"] == 3
+    counts = prune(policy, archive, engine=engine)
+
+    assert counts == {"reviews": 3, "tools": 0, "origins": 0}
+    with engine.connect() as conn:
+        kept = conn.execute(select(Review.last_checked_at)).scalars().all()
+    assert sorted(kept) == [NOW + timedelta(days=3), NOW + timedelta(days=4)]
+
+
+def test_prunes_reviewless_tools_and_restores_them(engine, tmp_path):
+    with Session(engine) as db:
+        dead = _add_tool(db, "dead")
+        _add_review(db, dead, NOW - timedelta(days=400), status="gone")
+        alive = _add_tool(db, "alive")
+        _add_review(db, alive, datetime.utcnow())
+        db.commit()
+
+    archive = str(tmp_path / "archive.ndjson.gz")
+    counts = prune(RetentionPolicy(archived_days=30), archive, engine=engine)
+    assert counts == {"reviews": 1, "tools": 1, "origins": 1}
+    assert _count(engine, Tool) == 1
+
+    assert restore(archive, engine=engine) == {
+        "restored": 3,
+        "present": 0,
+        "reassigned": 0,
+    }
+    assert _count(engine, Tool) == 2
+    assert _count(engine, Origin) == 2
+    assert _count(engine, Review) == 2
+
+
+def test_archived_days_count_from_when_the_link_died(
+    engine, tmp_path, monkeypatch
+):
+    with Session(engine) as db:
+        tool = _add_tool(db, "old")
+        _add_review(db, tool, datetime.utcnow() - timedelta(days=100))
+        db.commit()
+
+    async def head_ok(url):
+        return False
+
+    monkeypatch.setattr(ingest, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(ingest, "head_ok", head_ok)
+    asyncio.run(ingest.check_links())
+    with engine.connect() as conn:
+        archived_at = conn.execute(select(Review.last_checked_at)).scalar()
+    # Re-checking a dead link keeps the time it was archived
+    asyncio.run(ingest.check_links())
+    with engine.connect() as conn:
+        status, checked = conn.execute(
+            select(Review.status, Review.last_checked_at)
+        ).one()
+    assert status == "archived"
+    assert checked == archived_at > datetime.utcnow() - timedelta(days=1)
+
+    archive = str(tmp_path / "archive.ndjson.gz")
+    counts = prune(RetentionPolicy(archived_days=90), archive, engine=engine)
+    assert counts == {"reviews": 0, "tools": 0, "origins": 0}
+
+
+def test_restore_does_not_drop_rows_whose_id_was_reused(engine, tmp_path):
+    with Session(engine) as db:
+        tool = _add_tool(db, "a")
+        for _ in range(5):
+            _add_review(db, tool, datetime.utcnow())
+        # Reviews 6-9 are dead links, i.e. the highest ids get pruned
+        for day in range(4):
+            _add_review(db, tool, NOW + timedelta(days=day), status="gone")
+        db.commit()
+        tool_id = tool.id
+
+    archive = str(tmp_path / "archive.ndjson.gz")
+    prune(RetentionPolicy(keep_snapshots=0, archived_days=30), archive, engine=engine)
+    with Session(engine) as db:
+        # SQLite hands out id 6 again
+        _add_review(db, db.get(Tool, tool_id), datetime.utcnow())
+        db.commit()
+    assert _count(engine, Review) == 6
+
+    counts = restore(archive, engine=engine)
+    assert counts["restored"] + counts["reassigned"] == 4
+    assert counts["reassigned"] >= 1
+    assert _count(engine, Review) == 10
+
+    # Restoring the same archive again changes nothing
+    assert restore(archive, engine=engine)["present"] == 4
+    assert _count(engine, Review) == 10
+
+
+def test_vacuum_switches_sqlite_to_incremental(engine, tmp_path):
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA auto_vacuum")).scalar() == 0
+    prune(RetentionPolicy(), str(tmp_path / "a.ndjson.gz"), engine=engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2
@@ -0,0 +1,163 @@
+"""Tests for publishing and serving read-only snapshots."""
+
+import os
+import subprocess
+import sys
+import pytest
+from sqlalchemy import create_engine, text
+from app.db import Base
+from app.models import SCHEMA_VERSION
+from app.snapshot import (
+    SnapshotReader,
+    SnapshotUnavailable,
+    current_snapshot,
+    prepare_staging,
+    publish,
+    staging_path,
+)
+
+
+def _staging_engine(directory):
+    engine = create_engine(f"sqlite:///{staging_path(str(directory))}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO schema_version (id, version) VALUES (1, :v)"),
+            {"v": SCHEMA_VERSION},
+        )
+    return engine
+
+
+def _add_tool(engine, slug):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO tools (slug, name, created_at, updated_at) "
+                "VALUES (:slug, :slug, '2025-01-01', '2025-01-01')"
+            ),
+            {"slug": slug},
+        )
+
+
+def _count_tools(session):
+    return session.execute(text("SELECT count(*) FROM tools")).scalar()
+
+
+def test_reader_is_unavailable_before_first_publish(tmp_path):
+    reader = SnapshotReader(str(tmp_path), check_interval=0)
+    assert not reader.available()
+    with pytest.raises(SnapshotUnavailable):
+        next(reader.get_db())
+
+
+def test_reader_switches_to_new_snapshot_without_restart(tmp_path):
+    engine = _staging_engine(tmp_path)
+    _add_tool(engine, "one")
+    first = publish(str(tmp_path), bind=engine)
+    assert oct(os.stat(first).st_mode & 0o777) == "0o444"
+
+    reader = SnapshotReader(str(tmp_path), check_interval=0)
+    old = reader.get_db()
+    old_session = next(old)
+    assert _count_tools(old_session) == 1
+
+    _add_tool(engine, "two")
+    second = publish(str(tmp_path), bind=engine)
+    assert current_snapshot(str(tmp_path)) == second
+
+    new = reader.get_db()
+    assert _count_tools(next(new)) == 2
+    # A request that started on the old snapshot keeps seeing it
+    assert _count_tools(old_session) == 1
+    old.close()
+    new.close()
+
+
+def test_snapshot_is_read_only_and_analyzed(tmp_path):
+    engine = _staging_engine(tmp_path)
+    _add_tool(engine, "one")
+    publish(str(tmp_path), bind=engine)
+    session = next(SnapshotReader(str(tmp_path), check_interval=0).get_db())
+    assert session.execute(text("SELECT count(*) FROM sqlite_stat1")).scalar()
+    with pytest.raises(Exception):
+        session.execute(text("DELETE FROM tools"))
+
+
+def test_reader_handles_special_characters_in_path(tmp_path):
+    directory = tmp_path / "snap shots #1 ?x %41"
+    directory.mkdir()
+    engine = _staging_engine(directory)
+    publish(str(directory), bind=engine)
+    assert SnapshotReader(str(directory), check_interval=0).available()
+
+
+def test_reader_skips_snapshot_with_wrong_schema_version(tmp_path):
+    engine = _staging_engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE schema_version SET version = version + 1"))
+    publish(str(tmp_path), bind=engine)
+    assert not SnapshotReader(str(tmp_path), check_interval=0).available()
+
+
+def test_staging_is_seeded_from_existing_database(tmp_path):
+    seed_dir = tmp_path / "seed"
+    seed_dir.mkdir()
+    seed = _staging_engine(seed_dir)
+    _add_tool(seed, "existing")
+
+    snapshots = tmp_path / "snapshots"
+    prepare_staging(str(snapshots), f"sqlite:///{staging_path(str(seed_dir))}")
+    staging = create_engine(f"sqlite:///{staging_path(str(snapshots))}")
+    with staging.connect() as conn:
+        assert _count_tools(conn) == 1
+
+
+def test_empty_staging_file_is_seeded(tmp_path):
+    seed_dir = tmp_path / "seed"
+    seed_dir.mkdir()
+    _add_tool(_staging_engine(seed_dir), "existing")
+
+    # Connecting to the staging engine before the first publish leaves an
+    # empty file behind
+    snapshots = tmp_path / "snapshots"
+    snapshots.mkdir()
+    open(staging_path(str(snapshots)), "wb").close()
+
+    prepare_staging(str(snapshots), f"sqlite:///{staging_path(str(seed_dir))}")
+    staging = create_engine(f"sqlite:///{staging_path(str(snapshots))}")
+    with staging.connect() as conn:
+        assert _count_tools(conn) == 1
+
+
+def test_staging_prefers_current_snapshot_over_seed(tmp_path):
+    engine = _staging_engine(tmp_path)
+    _add_tool(engine, "published")
+    publish(str(tmp_path), bind=engine)
+    engine.dispose()
+    os.remove(staging_path(str(tmp_path)))
+
+    prepare_staging(str(tmp_path), "sqlite:///does-not-exist.db")
+    staging = create_engine(f"sqlite:///{staging_path(str(tmp_path))}")
+    with staging.begin() as conn:
+        assert _count_tools(conn) == 1
+        # The copy of a read-only snapshot must be writable again
+        conn.execute(text("DELETE FROM tools"))
+
+
+def test_api_answers_503_before_first_publish(tmp_path):
+    env = dict(os.environ, SNAPSHOT_DIR=str(tmp_path))
+    script = (
+        "import asyncio\n"
+        "from app.coldstart import _first_request\n"
+        "from app.main import app\n"
+        "print(asyncio.run(_first_request(app)))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert out.strip().splitlines()[-1] == "503"
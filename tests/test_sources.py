@@ -0,0 +1,216 @@
+"""Tests for the adapter registry, quotas, fan-out and scheduler."""
+
+import asyncio
+import contextlib
+import logging
+import time
+from urllib.parse import parse_qs, urlparse
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app import ingest, scheduler
+from app.sources import registry
+from app.sources.base import (
+    AdapterConfig,
+    DiscoveredTool,
+    Quota,
+    QuotaExhausted,
+    SourceAdapter,
+    merge,
+)
+from app.sources import stackexchange
+from app.sources.github import GitHubAdapter, GitHubConfig
+from app.sources.stackexchange import StackExchangeAdapter, StackExchangeConfig
+
+
+async def _stream(prefix: str, count: int, fail: bool = False):
+    for i in range(count):
+        await asyncio.sleep(0)
+        yield DiscoveredTool(name=f"{prefix}{i}")
+    if fail:
+        raise RuntimeError(f"{prefix} failed")
+
+
+class _FakeAdapter(SourceAdapter):
+    async def discover(self):
+        yield DiscoveredTool(name="fake")
+
+
+@pytest.fixture
+def fake_registry(monkeypatch):
+    """Registry containing a built-in key and a plugin with a new key."""
+    monkeypatch.setattr(registry, "_loaded", True)
+    monkeypatch.setattr(
+        registry,
+        "_REGISTRY",
+        {"hacker_news": _FakeAdapter, "reddit": _FakeAdapter},
+    )
+
+
+def test_quota_paces_requests_within_window():
+    async def run():
+        quota = Quota(limit=2, window=0.2, max_wait=1)
+        started = time.monotonic()
+        for _ in range(3):
+            await quota.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.2
+
+
+def test_quota_raises_when_wait_exceeds_max_wait():
+    async def run():
+        quota = Quota(limit=1, window=3600, max_wait=1)
+        await quota.acquire()
+        await quota.acquire()
+
+    with pytest.raises(QuotaExhausted) as exc:
+        asyncio.run(run())
+    assert exc.value.retry_after > 1
+
+
+def test_quota_sync_uses_remaining_reported_by_api():
+    quota = Quota(limit=100, window=60)
+    quota.sync(3)
+    assert quota.remaining() == 3
+
+
+def test_merge_yields_items_from_all_streams():
+    async def run():
+        streams = [_stream("a", 3), _stream("b", 2)]
+        return [item["name"] async for item in merge(streams, concurrency=2)]
+
+    assert sorted(asyncio.run(run())) == ["a0", "a1", "a2", "b0", "b1"]
+
+
+def test_merge_propagates_stream_errors():
+    async def run():
+        streams = [_stream("a", 100), _stream("b", 1, fail=True)]
+        return [item async for item in merge(streams)]
+
+    with pytest.raises(RuntimeError, match="b failed"):
+        asyncio.run(run())
+
+
+def test_github_fans_out_one_query_per_topic():
+    adapter = GitHubAdapter(GitHubConfig(topics=["cli", "tui"]))
+    queries = adapter.queries()
+    assert len(queries) == 2
+    assert queries[0].endswith("topic:cli")
+    assert adapter.quota.limit == 10
+
+
+def test_stackexchange_backoff_holds_back_other_sites(monkeypatch):
+    requests = []
+
+    class _Response:
+        def __init__(self, data):
+            self.data = data
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.data
+
+    class _Client:
+        async def get(self, url):
+            qs = parse_qs(urlparse(url).query)
+            site, page = qs["site"][0], int(qs["page"][0])
+            requests.append((site, page, time.monotonic()))
+            if site == "a":
+                return _Response({"items": [], "backoff": 0.3})
+            if page == 1:
+                await asyncio.sleep(0.1)
+            return _Response({"items": [], "has_more": True})
+
+    @contextlib.asynccontextmanager
+    async def client():
+        yield _Client()
+
+    monkeypatch.setattr(stackexchange, "client", client)
+    adapter = StackExchangeAdapter(
+        StackExchangeConfig(sites=["a", "b"], pages=2, concurrency=2)
+    )
+
+    async def run():
+        return [item async for item in adapter.discover()]
+
+    asyncio.run(run())
+    backoff_at = next(t for site, _, t in requests if site == "a")
+    second_page_at = next(
+        t for site, page, t in requests if site == "b" and page == 2
+    )
+    assert second_page_at - backoff_at >= 0.3
+
+
+def test_load_adapters_skips_unknown_plugin_keys(fake_registry, caplog):
+    with caplog.at_level(logging.WARNING):
+        adapters = ingest.load_adapters()
+    assert list(adapters) == ["hacker_news"]
+    assert "reddit" in caplog.text
+
+
+def test_load_adapters_rejects_requested_unknown_key(fake_registry):
+    with pytest.raises(ValueError, match="reddit"):
+        ingest.load_adapters(["reddit"])
+
+
+def test_run_source_survives_link_check_failure(monkeypatch):
+    async def ingest_source(db, key, adapter):
+        return 1
+
+    async def check_links(kinds):
+        raise OSError("network down")
+
+    monkeypatch.setattr(scheduler, "ingest_source", ingest_source)
+    monkeypatch.setattr(scheduler, "check_links", check_links)
+    schedule = scheduler.SourceSchedule(
+        "hacker_news", _FakeAdapter(AdapterConfig(interval=60))
+    )
+    asyncio.run(scheduler.run_source(schedule))
+    assert schedule.next_run > time.monotonic()
+
+
+def test_check_links_does_not_hold_write_lock_during_requests(
+    engine, tmp_path, monkeypatch
+):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO tools (id, slug, name, created_at, updated_at) "
+                "VALUES (1, 't', 't', '2025-01-01', '2025-01-01')"
+            )
+        )
+        for i in range(3):
+            conn.execute(
+                text(
+                    "INSERT INTO reviews (tool_id, source_kind, source_url, "
+                    "snippet, status) VALUES (1, 'HACKER_NEWS', :url, '', "
+                    "'active')"
+                ),
+                {"url": f"https://example.com/{i}"},
+            )
+    # A second writer that gives up almost immediately on a locked database
+    writer = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}", connect_args={"timeout": 0.1}
+    )
+
+    async def head_ok(url):
+        with writer.begin() as conn:
+            conn.execute(text("UPDATE tools SET name = :url"), {"url": url})
+        return url.endswith("0")
+
+    monkeypatch.setattr(ingest, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(ingest, "head_ok", head_ok)
+    asyncio.run(ingest.check_links())
+    writer.dispose()
+    with engine.connect() as conn:
+        statuses = conn.execute(
+            text("SELECT source_url, status FROM reviews ORDER BY id")
+        ).all()
+    assert [status for _, status in statuses] == [
+        "active",
+        "archived",
+        "archived",
+    ]